@@ -1,44 +1,103 @@
 import json
 import logging
 import os
+import queue
 import re
+import threading
+import httpx
 import openai
-from typing import List, Dict, Any
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Configure OpenAI API
-openai.api_key = os.environ.get("OPENAI_API_KEY")
+# Configure OpenAI API with one shared client, so its pooled HTTP/2 connection
+# (and TLS session) is reused across requests instead of reconnecting per call
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+_openai_client = openai.OpenAI(
+    api_key=OPENAI_API_KEY,
+    http_client=httpx.Client(http2=True, limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+) if OPENAI_API_KEY else None
+
+# Joins texts into one corpus for single-pass scanning; no pattern matches across it
+_DOC_SEPARATOR = "\x00"
+
+# A sentence ends at '.', '!' or '?' followed by whitespace (the same rule as
+# splitting on r'(?<=[.!?])\s+'); matches are one character long
+_SENTENCE_END = re.compile(r'[.!?](?=\s)')
 
 # In a real implementation, you would use spaCy for NLP processing
 # For demo purposes, we'll use regex-based extraction to avoid dependencies
 # import spacy
 # nlp = spacy.load("en_core_web_sm")
 
+class ContentGenerationError(Exception):
+    """Raised by generate_content_ideas(fallback=False) when the OpenAI request fails."""
+
+
 class RedditAnalyzer:
+    # Templates for TikTok
+    _TIKTOK_TEMPLATES = (
+        "Short video idea: Create a video addressing '{point}' with a surprising solution at the end.",
+        "Hook concept: Start with 'Did you know?' and then address '{point}' with a quick practical hack.",
+        "Personal story: Share your 30-second story of overcoming '{point}' with actionable takeaways.",
+        "Comparison video: Do a side-by-side showing the wrong vs. right way to handle '{point}'.",
+        "POV concept: Create a POV video showing the daily struggle with '{point}' and a moment of victory."
+    )
+    
+    # Templates for Instagram
+    _INSTAGRAM_TEMPLATES = (
+        "Carousel idea: Create a slideshow with 5 evidence-based strategies to address '{point}'.",
+        "Infographic concept: Share a visually appealing breakdown of the science behind '{point}'.",
+        "Before/after post: Show a transformation journey related to overcoming '{point}'.",
+        "Tutorial reel: Demonstrate a 3-step process viewers can follow to overcome '{point}'.",
+        "Quote series: Share powerful statements that resonate with people experiencing '{point}'."
+    )
+    
+    # Keywords that mark a sentence as a pain point (lowercase substrings)
+    pain_point_keywords = (
+        'challenge', 'problem', 'struggle', 'difficult', 
+        'hard', 'issue', 'trouble', 'worry', 'concerned',
+        'frustrating', 'overwhelmed', 'anxious', 'tired',
+        'exhausted', 'help', 'advice', 'suggestion', 'tips'
+    )
+    
+    # Regex trigger phrases for pain point detection (lowercase, matched against
+    # lowercased text); the rest of the sentence after a trigger is captured
+    pain_point_patterns = (
+        r'(?:struggle|struggling) with',
+        r'(?:difficult|hard) to',
+        r'(?:problem|issue|challenge) (?:with|is|in)',
+        r'(?:need|looking for) (?:help|advice|guidance)',
+        r'(?:how (?:do|can) (?:i|you|we))',
+        r'(?:any tips for)'
+    )
+    
+    # Minimum combined length of the prompt's pain points for an OpenAI request
+    MIN_OPENAI_PROMPT_CHARS = 100
+    
     def __init__(self):
         """Initialize the Reddit content analyzer."""
-        self.pain_point_keywords = [
-            'challenge', 'problem', 'struggle', 'difficult', 
-            'hard', 'issue', 'trouble', 'worry', 'concerned',
-            'frustrating', 'overwhelmed', 'anxious', 'tired',
-            'exhausted', 'help', 'advice', 'suggestion', 'tips'
-        ]
-        
-        # Regex patterns for pain point detection
-        self.pain_point_patterns = [
-            r'(?i)(?:struggle|struggling) with\s+([^.!?]+)[.!?]',
-            r'(?i)(?:difficult|hard) to\s+([^.!?]+)[.!?]',
-            r'(?i)(?:problem|issue|challenge) (?:with|is|in)\s+([^.!?]+)[.!?]',
-            r'(?i)(?:need|looking for) (?:help|advice|guidance)\s+([^.!?]+)[.!?]',
-            r'(?i)(?:how (?:do|can) (?:I|you|we))\s+([^.!?]+)[.!?]',
-            r'(?i)(?:any tips for)\s+([^.!?]+)[.!?]'
-        ]
+        # Precompile regexes used on every extraction/parse call
+        # Single alternation so each sentence is scanned once for any keyword.
+        # Case-sensitive patterns run against lowercased text: without IGNORECASE
+        # the regex engine can skip ahead to candidate first characters.
+        self._keyword_re = re.compile('|'.join(map(re.escape, self.pain_point_keywords)))
+        # One alternation over all triggers so the text is scanned once; captured
+        # spans stop at document separators when scanning a corpus
+        self._combined_pattern = re.compile(
+            r'(?:' + '|'.join(self.pain_point_patterns) + r')\s+([^.!?' + _DOC_SEPARATOR + r']+)[.!?]'
+        )
+        self._numbered_re = re.compile(r'^\d+[\.\)]\s|^-\s')
+        # Splits a whole response into items at numbered/dashed line starts
+        self._idea_split_re = re.compile(r'(?m)^(?:\d+[.)]|-)\s+')
+        self._line_break_re = re.compile(r'\s*\n\s*')
         
         # Check if OpenAI API key is available
-        if not openai.api_key:
+        if _openai_client is None:
             logger.warning("OpenAI API key not found. Will use template-based content generation.")
     
     def extract_pain_points(self, text: str) -> List[str]:
@@ -53,30 +112,11 @@ class RedditAnalyzer:
         """
         if not text:
             return []
-            
-        # Split text into sentences (basic implementation)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        pain_points = []
         
-        # Method 1: Keyword-based extraction
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in self.pain_point_keywords):
-                pain_points.append(sentence.strip())
+        pain_points = self._scan_texts([text])
         
-        # Method 2: Pattern-based extraction
-        for pattern in self.pain_point_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                pain_points.append(match.strip())
-        
-        # Remove duplicates while preserving order
-        unique_pain_points = []
-        for point in pain_points:
-            if point not in unique_pain_points and len(point) > 10:  # Minimum length filter
-                unique_pain_points.append(point)
-        
-        return unique_pain_points
+        # Remove duplicates while preserving order (dict keys keep insertion order)
+        return [point for point in dict.fromkeys(pain_points) if len(point) > 10]  # Minimum length filter
     
     def process_subreddit_data(self, data: Dict[str, Any]) -> List[str]:
         """
@@ -92,36 +132,109 @@ class RedditAnalyzer:
             logger.warning("Invalid data format for pain point extraction")
             return []
             
-        all_pain_points = []
+        texts = []
         
-        # Process each post
+        # Collect post titles, post content and comments in document order
         for post in data['posts']:
-            # Extract from post title
-            if 'title' in post:
-                title_points = self.extract_pain_points(post['title'])
-                all_pain_points.extend(title_points)
+            texts.append(post.get('title'))
+            texts.append(post.get('content'))
+            for comment in post.get('comments', []):
+                texts.append(comment.get('content'))
+        
+        all_pain_points = self._scan_texts(texts)
+        
+        # Remove duplicates while preserving order. Each string's hash is computed
+        # once and cached on the object, and full comparisons only happen on hash
+        # matches, so keying on separate hash values would save nothing and could
+        # drop distinct points on a collision.
+        return [point for point in dict.fromkeys(all_pain_points) if len(point) > 10]
+    
+    def _scan_texts(self, texts: List[str]) -> List[str]:
+        """
+        Find candidate pain points in several texts with one pass per regex.
+        
+        The texts are joined into a single corpus, scanned once for sentence
+        boundaries, keywords and patterns, and every hit is mapped back to its
+        source text by offset.
+        
+        Args:
+            texts: The texts to analyze, in document order (empty ones are skipped)
             
-            # Extract from post content
-            if 'content' in post:
-                content_points = self.extract_pain_points(post['content'])
-                all_pain_points.extend(content_points)
+        Returns:
+            Candidate pain points, grouped per text: keyword sentences first,
+            then pattern matches (not deduplicated or length-filtered)
+        """
+        texts = [text for text in texts if text]
+        if not texts:
+            return []
+        
+        corpus = _DOC_SEPARATOR.join(texts)
+        # Regexes scan this lowercased copy and results are sliced from corpus.
+        # U+0130 is the only character that lowercases to more than one code
+        # point, so mapping it to 'i' first keeps offsets aligned.
+        folded = corpus.replace('\u0130', 'i').lower()
+        doc_starts = list(accumulate((len(text) + len(_DOC_SEPARATOR) for text in texts[:-1]), initial=0))
+        
+        # Entries sort into per-text order: (text, method, offset, point)
+        found = []
+        
+        # Method 1: Keyword-based extraction (each matching sentence once).
+        # The loop runs once per matching sentence; its boundaries are located
+        # with C-level string searches and the next keyword is searched for
+        # after the sentence ends.
+        sentence_end = 0
+        hit = self._keyword_re.search(folded)
+        while hit is not None:
+            position = hit.start()
+            doc = bisect_right(doc_starts, position) - 1
+            doc_end = doc_starts[doc + 1] - len(_DOC_SEPARATOR) if doc + 1 < len(doc_starts) else len(folded)
+            sentence_start, sentence_end = self._sentence_bounds(
+                folded, max(doc_starts[doc], sentence_end), position, doc_end
+            )
+            found.append((doc, 0, sentence_start, corpus[sentence_start:sentence_end].strip()))
+            hit = self._keyword_re.search(folded, sentence_end)
+        
+        # Method 2: Pattern-based extraction
+        for match in self._combined_pattern.finditer(folded):
+            doc = bisect_right(doc_starts, match.start()) - 1
+            found.append((doc, 1, match.start(), corpus[match.start(1):match.end(1)].strip()))
+        
+        found.sort()
+        return [entry[-1] for entry in found]
+    
+    @staticmethod
+    def _sentence_bounds(text: str, lower: int, position: int, upper: int) -> Tuple[int, int]:
+        """
+        Find the sentence around a position without splitting the whole text.
+        
+        Sentences end at '.', '!' or '?' followed by whitespace (_SENTENCE_END).
+        Only the range between lower and the end of the sentence is scanned,
+        each character once, so a long run of punctuation that is not followed
+        by whitespace (ellipses, URLs, "a.b.c") stays linear.
+        
+        Args:
+            text: The text to search
+            lower: A known sentence boundary at or before position
+            position: An offset inside the sentence
+            upper: A known sentence boundary after position (e.g. the text end)
             
-            # Extract from comments
-            if 'comments' in post:
-                for comment in post['comments']:
-                    if 'content' in comment:
-                        comment_points = self.extract_pain_points(comment['content'])
-                        all_pain_points.extend(comment_points)
-        
-        # Remove duplicates while preserving order
-        unique_pain_points = []
-        for point in all_pain_points:
-            if point not in unique_pain_points:
-                unique_pain_points.append(point)
-        
-        return unique_pain_points
+        Returns:
+            (start, end) offsets of the sentence; start may include leading whitespace
+        """
+        # The last boundary before position; endpos lets the lookahead see
+        # text[position] but keeps a mark at position itself out of range
+        start = lower
+        for mark in _SENTENCE_END.finditer(text, lower, position + 1):
+            start = mark.end()
+        
+        # The first boundary at or after position
+        mark = _SENTENCE_END.search(text, position, upper)
+        end = mark.end() if mark is not None else upper
+        
+        return start, end
     
-    def generate_content_ideas(self, subreddit: str, pain_points: List[str], platform: str = "all") -> Dict[str, List[str]]:
+    def generate_content_ideas(self, subreddit: str, pain_points: List[str], platform: str = "all",
+                               fallback: bool = True) -> Dict[str, List[str]]:
         """
         Generate content ideas based on extracted pain points.
         
@@ -129,21 +242,49 @@ class RedditAnalyzer:
             subreddit: The subreddit name
             pain_points: List of extracted pain points
             platform: Target platform (tiktok, instagram, or all)
+            fallback: Whether an OpenAI failure falls back to template ideas. If
+                False it raises ContentGenerationError instead, so callers can
+                tell (and avoid caching) a fallback result.
             
         Returns:
             Dictionary with content ideas by platform
         """
-        # Check if we have pain points and OpenAI API key
-        if pain_points and openai.api_key:
+        # Check if the pain points are worth an OpenAI request
+        if self._use_openai(pain_points):
             try:
                 return self.generate_content_ideas_with_openai(subreddit, pain_points, platform)
             except Exception as e:
+                if not fallback:
+                    raise ContentGenerationError(str(e)) from e
                 logger.error(f"Error generating content ideas with OpenAI: {str(e)}")
                 logger.info("Falling back to template-based generation")
                 return self.generate_content_ideas_with_templates(subreddit, pain_points, platform)
         else:
             return self.generate_content_ideas_with_templates(subreddit, pain_points, platform)
     
+    def _use_openai(self, pain_points: List[str]) -> bool:
+        """
+        Decide whether pain points justify an OpenAI request.
+        
+        Low-information input (fewer than two distinct points among the ones sent
+        in the prompt, or too little text overall) gets template ideas instead of
+        a multi-second API round-trip.
+        
+        Args:
+            pain_points: List of extracted pain points
+            
+        Returns:
+            True if OpenAI is configured and the input is worth a request
+        """
+        if not pain_points or _openai_client is None:
+            return False
+        
+        selected_pain_points = pain_points[:5]
+        return (
+            len(set(selected_pain_points)) >= 2
+            and sum(len(point) for point in selected_pain_points) >= self.MIN_OPENAI_PROMPT_CHARS
+        )
+    
     def generate_content_ideas_with_openai(self, subreddit: str, pain_points: List[str], platform: str = "all") -> Dict[str, List[str]]:
         """
         Generate content ideas using OpenAI API.
@@ -156,6 +297,104 @@ class RedditAnalyzer:
         Returns:
             Dictionary with content ideas by platform
         """
+        prompts = self._build_prompts(subreddit, pain_points)
+        
+        # Generate content ideas for both platforms concurrently; each call is a
+        # network round-trip, so the total wait is the slower of the two
+        with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+            futures = {
+                name: executor.submit(self._create_completion, system_prompt, user_prompt)
+                for name, (system_prompt, user_prompt) in prompts.items()
+            }
+            responses = {name: future.result() for name, future in futures.items()}
+        
+        # Extract and clean the responses
+        return {
+            name: self.parse_openai_response(response.choices[0].message.content)
+            for name, response in responses.items()
+        }
+    
+    def stream_content_ideas(self, subreddit: str, pain_points: List[str], platform: str = "all") -> Iterator[Dict[str, str]]:
+        """
+        Generate content ideas, yielding each one as soon as it is complete.
+        
+        OpenAI responses are streamed for both platforms concurrently and each
+        numbered idea is emitted once the line starting the next one arrives.
+        Falls back to templates when OpenAI is unavailable or fails.
+        
+        Args:
+            subreddit: The subreddit name
+            pain_points: List of extracted pain points
+            platform: Target platform (tiktok, instagram, or all)
+            
+        Yields:
+            Dictionaries of the form {"platform": ..., "idea": ...}
+        """
+        if not self._use_openai(pain_points):
+            ideas = self.generate_content_ideas_with_templates(subreddit, pain_points, platform)
+            for name, platform_ideas in ideas.items():
+                for idea in platform_ideas:
+                    yield {"platform": name, "idea": idea}
+            return
+        
+        prompts = self._build_prompts(subreddit, pain_points)
+        results = queue.Queue()
+        # Set when the consumer stops early (e.g. the client disconnected)
+        stop = threading.Event()
+        
+        def produce(name: str, system_prompt: str, user_prompt: str):
+            stream = None
+            try:
+                stream = self._create_completion(system_prompt, user_prompt, stream=True)
+                for idea in self._iter_streamed_ideas(stream):
+                    if stop.is_set():
+                        break
+                    results.put((name, idea))
+            except Exception as e:
+                logger.error(f"Error streaming {name} content ideas from OpenAI: {str(e)}")
+                results.put((name, e))
+            finally:
+                if stop.is_set() and hasattr(stream, "close"):
+                    stream.close()  # Release the HTTP connection instead of draining it
+                results.put((name, None))
+        
+        executor = ThreadPoolExecutor(max_workers=len(prompts))
+        try:
+            for name, (system_prompt, user_prompt) in prompts.items():
+                executor.submit(produce, name, system_prompt, user_prompt)
+            
+            pending = len(prompts)
+            yielded = {name: 0 for name in prompts}
+            while pending:
+                name, item = results.get()
+                if item is None:
+                    pending -= 1
+                elif isinstance(item, Exception):
+                    if not yielded[name]:
+                        logger.info(f"Falling back to template-based generation for {name}")
+                        for idea in self.generate_content_ideas_with_templates(subreddit, pain_points, platform)[name]:
+                            yield {"platform": name, "idea": idea}
+                else:
+                    yielded[name] += 1
+                    yield {"platform": name, "idea": item}
+        finally:
+            # If the generator is closed early (GeneratorExit on a client
+            # disconnect), waiting here would block the server thread until
+            # both OpenAI streams finish; tell the producers to stop instead
+            stop.set()
+            executor.shutdown(wait=False)
+    
+    def _build_prompts(self, subreddit: str, pain_points: List[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Build the OpenAI prompts for each platform.
+        
+        Args:
+            subreddit: The subreddit name
+            pain_points: List of extracted pain points
+            
+        Returns:
+            Dictionary mapping platform to its (system prompt, user prompt)
+        """
         # Limit pain points to avoid token limits
         selected_pain_points = pain_points[:5]
         
@@ -187,68 +426,95 @@ class RedditAnalyzer:
         Do not include hashtags or emojis.
         """
         
-        # Generate content ideas for TikTok
-        tiktok_response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a creative social media content strategist specialized in TikTok."},
-                {"role": "user", "content": tiktok_prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
-        
-        # Generate content ideas for Instagram
-        instagram_response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a creative social media content strategist specialized in Instagram."},
-                {"role": "user", "content": instagram_prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
-        
-        # Extract and clean the responses
-        tiktok_ideas = self.parse_openai_response(tiktok_response.choices[0].message.content)
-        instagram_ideas = self.parse_openai_response(instagram_response.choices[0].message.content)
-        
         return {
-            "tiktok": tiktok_ideas,
-            "instagram": instagram_ideas
+            "tiktok": ("You are a creative social media content strategist specialized in TikTok.", tiktok_prompt),
+            "instagram": ("You are a creative social media content strategist specialized in Instagram.", instagram_prompt)
         }
     
-    def parse_openai_response(self, response_text: str) -> List[str]:
+    def _create_completion(self, system_prompt: str, user_prompt: str, stream: bool = False):
         """
-        Parse the OpenAI response into a list of content ideas.
+        Request a chat completion from OpenAI.
         
         Args:
-            response_text: The raw text response from OpenAI
+            system_prompt: The system message describing the assistant's role
+            user_prompt: The user message with the content request
+            stream: Whether to return an iterator of response chunks
             
         Returns:
-            List of content ideas
+            The OpenAI chat completion response (or chunk stream)
         """
-        ideas = []
-        
-        # Split by lines and look for numbered items
-        lines = response_text.strip().split('\n')
+        return _openai_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=1000,
+            temperature=0.7,
+            stream=stream
+        )
+    
+    def _iter_streamed_ideas(self, stream) -> Iterator[str]:
+        """Yield content ideas from a streamed OpenAI response as each one completes."""
+        lines_seen = []
+        
+        def iter_lines():
+            buffer = ""
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                buffer += chunk.choices[0].delta.content or ""
+                *lines, buffer = buffer.split('\n')
+                lines_seen.extend(lines)
+                yield from lines
+            if buffer:
+                lines_seen.append(buffer)
+                yield buffer
+        
+        found = False
+        for idea in self._iter_numbered_ideas(iter_lines()):
+            found = True
+            yield idea
+        
+        # No numbered items; fall back to parsing the complete text
+        if not found:
+            yield from self.parse_openai_response('\n'.join(lines_seen))
+    
+    def _iter_numbered_ideas(self, lines: Iterable[str]) -> Iterator[str]:
+        """Yield numbered or dashed items from response lines, joining continuation lines."""
         current_idea = ""
         
         for line in lines:
             # Check if this is a new numbered item
-            if re.match(r'^\d+[\.\)]\s', line) or re.match(r'^-\s', line):
-                # If we have a current idea, add it to the list
+            marker = self._numbered_re.match(line)
+            if marker:
+                # If we have a current idea, it is complete
                 if current_idea:
-                    ideas.append(current_idea.strip())
+                    yield current_idea.strip()
                 
                 # Start a new idea
-                current_idea = line.split('.', 1)[-1].split(')', 1)[-1].strip()
+                current_idea = line[marker.end():].strip()
             elif current_idea:  # continuation of current idea
                 current_idea += " " + line.strip()
         
-        # Add the last idea if any
+        # The last idea, if any
         if current_idea:
-            ideas.append(current_idea.strip())
+            yield current_idea.strip()
+    
+    def parse_openai_response(self, response_text: str) -> List[str]:
+        """
+        Parse the OpenAI response into a list of content ideas.
+        
+        Args:
+            response_text: The raw text response from OpenAI
+            
+        Returns:
+            List of content ideas
+        """
+        # Split at numbered items in one pass; text before the first item
+        # (e.g. an introduction) is not an idea
+        parts = self._idea_split_re.split(response_text.strip())
+        ideas = [self._line_break_re.sub(' ', part.strip()) for part in parts[1:] if part.strip()]
         
         # If we couldn't parse the ideas correctly, split by double newlines
         if not ideas:
@@ -288,42 +554,32 @@ class RedditAnalyzer:
                 ]
             }
         
-        # Templates for TikTok
-        tiktok_templates = [
-            "Short video idea: Create a video addressing '{point}' with a surprising solution at the end.",
-            "Hook concept: Start with 'Did you know?' and then address '{point}' with a quick practical hack.",
-            "Personal story: Share your 30-second story of overcoming '{point}' with actionable takeaways.",
-            "Comparison video: Do a side-by-side showing the wrong vs. right way to handle '{point}'.",
-            "POV concept: Create a POV video showing the daily struggle with '{point}' and a moment of victory."
-        ]
-        
-        # Templates for Instagram
-        instagram_templates = [
-            "Carousel idea: Create a slideshow with 5 evidence-based strategies to address '{point}'.",
-            "Infographic concept: Share a visually appealing breakdown of the science behind '{point}'.",
-            "Before/after post: Show a transformation journey related to overcoming '{point}'.",
-            "Tutorial reel: Demonstrate a 3-step process viewers can follow to overcome '{point}'.",
-            "Quote series: Share powerful statements that resonate with people experiencing '{point}'."
-        ]
-        
-        # Generate ideas using templates and pain points
-        tiktok_ideas = []
-        instagram_ideas = []
-        
         # Use at most 3 pain points to avoid overwhelming users
-        for i, point in enumerate(pain_points[:3]):
-            tiktok_template = tiktok_templates[i % len(tiktok_templates)]
-            instagram_template = instagram_templates[i % len(instagram_templates)]
-            
-            tiktok_ideas.append(tiktok_template.format(point=point))
-            instagram_ideas.append(instagram_template.format(point=point))
+        tiktok_ideas, instagram_ideas = self._template_ideas(tuple(pain_points[:3]))
         
         return {
-            "tiktok": tiktok_ideas,
-            "instagram": instagram_ideas
+            "tiktok": list(tiktok_ideas),
+            "instagram": list(instagram_ideas)
         }
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _template_ideas(cls, points: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Format the TikTok and Instagram templates with the given pain points (memoized)."""
+        tiktok_ideas = tuple(
+            cls._TIKTOK_TEMPLATES[i % len(cls._TIKTOK_TEMPLATES)].format(point=point)
+            for i, point in enumerate(points)
+        )
+        instagram_ideas = tuple(
+            cls._INSTAGRAM_TEMPLATES[i % len(cls._INSTAGRAM_TEMPLATES)].format(point=point)
+            for i, point in enumerate(points)
+        )
+        return tiktok_ideas, instagram_ideas
 
 if __name__ == "__main__":
+    # Logging is configured by the entry point (app.py when serving the API)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
     # Basic test to see if the analyzer is working
     analyzer = RedditAnalyzer()
     
@@ -1,24 +1,51 @@
 import os
 import logging
 import json
-from flask import Flask, request, jsonify, abort
-from functools import wraps
+import time
+import orjson
+from flask import Flask, Response, request, jsonify, abort
+from flask.json.provider import DefaultJSONProvider
+from functools import lru_cache, wraps
 from flask_cors import CORS
 
-# Import our modules
-from scraper import RedditScraper
-from analyzer import RedditAnalyzer
-
-# Configure logging
+# Configure logging (the single process-wide configuration; done before importing
+# our modules so none of them can install a different one first)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Import our modules
+from scraper import get_scraper
+from analyzer import ContentGenerationError, RedditAnalyzer
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib json module."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)  # Used by jsonify and request.json
 CORS(app)  # Enable CORS for all routes
 
 # Set secure token from environment variable or use default for development
 SECURE_TOKEN = os.environ.get("API_SECURE_TOKEN", "default-dev-token-change-in-production")
 
+# How long (in seconds) generated content is reused for identical requests;
+# 0 or less disables response caching
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", 300))
+
+# Shared services, created once per process. The analyzer is read-only after
+# __init__, and the scraper's requests.Session draws from a thread-safe urllib3
+# connection pool, so both can serve concurrent requests.
+scraper = get_scraper()
+analyzer = RedditAnalyzer()
+
 def require_auth(f):
     """Decorator to require authentication via Bearer token."""
     @wraps(f)
@@ -36,11 +63,83 @@ def require_auth(f):
         return jsonify({"error": "Unauthorized access"}), 401
     return decorated
 
+def _invalid_content_params(subreddit, max_pages, platform):
+    """
+    Check the parameters of a generate-content request.
+    
+    They come straight from the request JSON and end up in lru_cache keys,
+    so anything other than the expected scalar types is rejected up front.
+    
+    Returns:
+        An error message, or None if the parameters are valid
+    """
+    if not isinstance(subreddit, str) or not subreddit:
+        return "'subreddit' must be a non-empty string"
+    if isinstance(max_pages, bool) or not isinstance(max_pages, int):
+        return "'max_pages' must be an integer"
+    if not isinstance(platform, str):
+        return "'platform' must be a string"
+    return None
+
 @app.route("/api/health", methods=["GET"])
 def health_check():
     """Endpoint to check if the API is running."""
     return jsonify({"status": "ok", "message": "API is running"})
 
+def _memoized(func, *args):
+    """
+    Call an lru_cached response builder for the current RESPONSE_CACHE_TTL window.
+    
+    The window (time() // RESPONSE_CACHE_TTL) is passed as the builder's last
+    argument, so cached entries expire when it rolls over. With caching
+    disabled the builder runs uncached.
+    """
+    if RESPONSE_CACHE_TTL <= 0:
+        return func.__wrapped__(*args, None)
+    return func(*args, int(time.time() // RESPONSE_CACHE_TTL))
+
+@lru_cache(maxsize=128)
+def _subreddit_pain_points(subreddit, max_pages, ttl_bucket):
+    """
+    Scrape a subreddit and extract its pain points.
+    
+    Results are memoized per (subreddit, max_pages) for the ttl_bucket window,
+    and returned as a tuple so callers cannot modify the cached copy.
+    """
+    reddit_data = scraper.scrape_subreddit(subreddit, max_pages=max_pages)
+    return tuple(analyzer.process_subreddit_data(reddit_data))
+
+def _content_response(subreddit, platform, pain_points, content_ideas):
+    """Assemble the /api/generate-content response body."""
+    return {
+        "subreddit": subreddit,
+        "pain_points": pain_points[:5],  # Return only top 5 pain points
+        "content_ideas": content_ideas,
+        "metadata": {
+            "total_pain_points": len(pain_points),
+            "platform": platform
+        }
+    }
+
+@lru_cache(maxsize=128)
+def _build_content_response(subreddit, max_pages, platform, ttl_bucket):
+    """
+    Run the scrape -> pain points -> content ideas pipeline for a subreddit.
+    
+    Results are memoized per (subreddit, max_pages, platform); ttl_bucket is
+    derived from the current time so cached entries expire after RESPONSE_CACHE_TTL.
+    An OpenAI failure raises ContentGenerationError rather than falling back
+    to templates, so a transient error is never cached.
+    """
+    # Steps 1 and 2: Scrape the subreddit and extract pain points (both cached)
+    pain_points = list(_memoized(_subreddit_pain_points, subreddit, max_pages))
+    
+    # Step 3: Generate content ideas
+    content_ideas = analyzer.generate_content_ideas(subreddit, pain_points, platform, fallback=False)
+    
+    # Step 4: Return the results
+    return _content_response(subreddit, platform, pain_points, content_ideas)
+
 @app.route("/api/generate-content", methods=["POST"])
 @require_auth
 def generate_content():
@@ -62,38 +161,73 @@ def generate_content():
         subreddit = data['subreddit']
         max_pages = data.get('max_pages', 2)
         platform = data.get('platform', 'all')
+        error = _invalid_content_params(subreddit, max_pages, platform)
+        if error:
+            return jsonify({"error": f"Invalid request. {error}."}), 400
         
         logger.info(f"Generating content ideas for r/{subreddit} (max_pages={max_pages}, platform={platform})")
         
-        # Initialize our services
-        scraper = RedditScraper()
-        analyzer = RedditAnalyzer()
+        # Identical requests within the same TTL window share one cached response
+        try:
+            response = _memoized(_build_content_response, subreddit, max_pages, platform)
+        except ContentGenerationError as e:
+            # Serve template ideas for this request only; the next one retries OpenAI
+            logger.error(f"Error generating content ideas with OpenAI: {str(e)}")
+            logger.info("Falling back to template-based generation")
+            pain_points = list(_memoized(_subreddit_pain_points, subreddit, max_pages))
+            content_ideas = analyzer.generate_content_ideas_with_templates(subreddit, pain_points, platform)
+            response = _content_response(subreddit, platform, pain_points, content_ideas)
         
-        # Step 1: Scrape the subreddit (with caching)
-        reddit_data = scraper.scrape_subreddit(subreddit, max_pages=max_pages)
+        return jsonify(response)
         
-        # Step 2: Extract pain points
-        pain_points = analyzer.process_subreddit_data(reddit_data)
+    except Exception as e:
+        logger.error(f"Error generating content: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Error processing request: {str(e)}"}), 500
+
+@app.route("/api/generate-content/stream", methods=["POST"])
+@require_auth
+def generate_content_stream():
+    """
+    Stream content ideas as newline-delimited JSON while they are generated.
+    
+    Accepts the same JSON payload as /api/generate-content. The first line
+    holds the pain points and metadata; each following line is one idea:
+    {"platform": "tiktok", "idea": "..."}
+    """
+    try:
+        data = request.json
+        if not data or 'subreddit' not in data:
+            return jsonify({"error": "Invalid request. Missing 'subreddit' parameter."}), 400
+            
+        subreddit = data['subreddit']
+        max_pages = data.get('max_pages', 2)
+        platform = data.get('platform', 'all')
+        error = _invalid_content_params(subreddit, max_pages, platform)
+        if error:
+            return jsonify({"error": f"Invalid request. {error}."}), 400
         
-        # Step 3: Generate content ideas
-        content_ideas = analyzer.generate_content_ideas(subreddit, pain_points, platform)
+        logger.info(f"Streaming content ideas for r/{subreddit} (max_pages={max_pages}, platform={platform})")
         
-        # Step 4: Return the results
-        response = {
+        # Scrape and extract up front so errors still produce a JSON error response
+        pain_points = list(_memoized(_subreddit_pain_points, subreddit, max_pages))
+        
+    except Exception as e:
+        logger.error(f"Error generating content: {str(e)}", exc_info=True)
+        return jsonify({"error": f"Error processing request: {str(e)}"}), 500
+    
+    def generate():
+        yield orjson.dumps({
             "subreddit": subreddit,
-            "pain_points": pain_points[:5],  # Return only top 5 pain points
-            "content_ideas": content_ideas,
+            "pain_points": pain_points[:5],
             "metadata": {
                 "total_pain_points": len(pain_points),
                 "platform": platform
             }
-        }
-        
-        return jsonify(response)
-        
-    except Exception as e:
-        logger.error(f"Error generating content: {str(e)}", exc_info=True)
-        return jsonify({"error": f"Error processing request: {str(e)}"}), 500
+        }) + b"\n"
+        for idea in analyzer.stream_content_ideas(subreddit, pain_points, platform):
+            yield orjson.dumps(idea) + b"\n"
+    
+    return Response(generate(), mimetype="application/x-ndjson")
 
 @app.route("/api/subreddit-info", methods=["GET"])
 @require_auth
@@ -109,11 +243,8 @@ def subreddit_info():
         if not subreddit:
             return jsonify({"error": "Missing 'subreddit' parameter"}), 400
             
-        # Initialize our services
-        scraper = RedditScraper()
-        
-        # Get basic subreddit information
-        data = scraper.scrape_subreddit(subreddit, max_pages=1)
+        # Get basic subreddit information (only the post count is used, so skip comments)
+        data = scraper.scrape_subreddit(subreddit, max_pages=1, fields=("id",))
         
         if 'error' in data and not data.get('posts'):
             return jsonify({"error": f"Error retrieving subreddit information: {data['error']}"}), 404
@@ -144,15 +275,8 @@ def get_pain_points():
         if not subreddit:
             return jsonify({"error": "Missing 'subreddit' parameter"}), 400
             
-        # Initialize our services
-        scraper = RedditScraper()
-        analyzer = RedditAnalyzer()
-        
-        # Get subreddit data
-        data = scraper.scrape_subreddit(subreddit, max_pages=2)
-        
-        # Extract pain points
-        pain_points = analyzer.process_subreddit_data(data)
+        # Scrape and extract pain points (shared with the generate-content endpoints)
+        pain_points = list(_memoized(_subreddit_pain_points, subreddit, 2))
         
         response = {
             "subreddit": subreddit,
@@ -174,5 +298,5 @@ if __name__ == "__main__":
     logger.info(f"Starting Reddit Insight API on port {port}")
     logger.info(f"API secure token is {'configured' if SECURE_TOKEN != 'default-dev-token-change-in-production' else 'using default (INSECURE)'}")
     
-    # Run the Flask app
-    app.run(host="0.0.0.0", port=port, debug=True) 
\ No newline at end of file
+    # Run the Flask development server (use gunicorn in production, see README)
+    app.run(host="0.0.0.0", port=port, debug=os.environ.get("FLASK_DEBUG") == "1", threaded=True) 
\ No newline at end of file
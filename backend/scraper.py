@@ -1,67 +1,393 @@
+import hashlib
 import json
 import os
 import requests  # Import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import math
+import mmap
+import tempfile
+import threading
 import time
-from typing import Dict, Any, List
-import re # Import re for markdown parsing fallback
-
-# Configure logging with more detailed format
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
-)
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+# JSON backend for API responses and cache files, fastest first: orjson, then
+# ujson, then the stdlib json module. All three read bytes directly, and
+# _json_dumps always returns compact UTF-8 bytes.
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    try:
+        import ujson
+
+        def _json_dumps(data: Any) -> bytes:
+            return ujson.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        _json_loads = ujson.loads
+    except ImportError:
+        def _json_dumps(data: Any) -> bytes:
+            return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+        _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+
+def _configure_logging(debug: bool = False):
+    """
+    Configure root logging with the scraper's detailed format.
+
+    Only called when the scraper runs as a script; applications importing the
+    module (like app.py) configure logging themselves.
+
+    Args:
+        debug: Log at DEBUG level instead of INFO
+    """
+    logging.basicConfig(
+        level=logging.DEBUG if debug else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+    )
+
 # Reddit base URL
 REDDIT_API_BASE = "https://www.reddit.com"
+# Endpoint templates, filled in per request with str.format. Only top-level
+# comments are used, so depth=1 keeps Reddit from sending the reply trees and
+# showmore=false drops the "load more" stubs
+HOT_LISTING_URL = REDDIT_API_BASE + "/r/{subreddit}/hot.json?limit={limit}"
+COMMENTS_URL = REDDIT_API_BASE + "/r/{subreddit}/comments/{post_id}.json?limit={limit}&sort=top&depth=1&showmore=false"
 # Custom User-Agent
 USER_AGENT = "RedditInsightApp/1.0 (by /u/YourRedditUsername)" # Replace with a descriptive user agent
+# Seconds a cached subreddit scrape stays fresh before it is fetched again
+SCRAPER_CACHE_TTL = int(os.environ.get("SCRAPER_CACHE_TTL", 3600))
+# Comments from an expired cache file younger than this are reused for posts
+# whose comment count has not changed, instead of being fetched again
+COMMENT_REUSE_MAX_AGE = int(os.environ.get("COMMENT_REUSE_MAX_AGE", 24 * 3600))
+# Concurrent comment requests per listing; stays below the session's pool size
+COMMENT_FETCH_WORKERS = 8
+# Requests are held back until the rate-limit window resets once Reddit
+# reports fewer than this many remaining; the margin covers requests the
+# comment workers already have in flight
+RATE_LIMIT_MIN_REMAINING = COMMENT_FETCH_WORKERS + 2
+# Cache files larger than this are memory-mapped instead of read into a buffer
+CACHE_MMAP_THRESHOLD = 64 * 1024
+# Most posts Reddit returns in one listing
+MAX_LISTING_LIMIT = 100
+
+
+def _read_cache(cache_file: Path, max_age: float) -> Optional[Dict[str, Any]]:
+    """Load a cache file if it exists and is younger than max_age seconds."""
+    try:
+        age = time.time() - os.path.getmtime(cache_file)
+    except OSError:
+        return None  # No cache file yet
+    if age >= max_age:
+        logger.info(f"Cache file {cache_file} expired ({age:.0f}s old)")
+        return None
+    try:
+        with open(cache_file, "rb") as f:
+            # orjson can parse straight out of the page cache through a
+            # memoryview; small files are cheaper to read in one go
+            if orjson is not None and os.fstat(f.fileno()).st_size > CACHE_MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return _json_loads(view)
+            return _json_loads(f.read())
+    except Exception as e:
+        logger.warning(f"Cache read failed for {cache_file}: {str(e)}. Re-fetching.")
+        return None
+
+
+def _write_cache(cache_file: Path, data: Dict[str, Any]) -> bool:
+    """
+    Atomically write data to cache_file so readers never see a partial file.
+
+    A blake2b digest of the serialized bytes is kept in a ``.sig`` sidecar.
+    When a re-scrape produces identical bytes the write is skipped and only
+    the file's mtime is refreshed, which keeps the cache entry fresh.
+
+    Args:
+        cache_file: Path of the cache file to write
+        data: Scrape results to serialize
+
+    Returns:
+        True if the file was rewritten, False if it was already up to date
+    """
+    serialized = _json_dumps(data)
+    digest = hashlib.blake2b(serialized, digest_size=16).digest()
+    sig_file = cache_file.with_name(cache_file.name + ".sig")
+    try:
+        if sig_file.read_bytes() == digest:
+            os.utime(cache_file)
+            return False
+    except OSError:
+        pass  # No signature or no cache file yet; write both below
+
+    # Drop the old signature first so a crash mid-write can never leave a
+    # signature that vouches for content the cache file does not hold
+    try:
+        sig_file.unlink()
+    except FileNotFoundError:
+        pass
+    fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(serialized)
+        os.replace(tmp_path, cache_file)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    sig_file.write_bytes(digest)
+    return True
+
+
+def _load_cached(cache_file: Path, cache_key: str, max_age: float) -> Optional[Dict[str, Any]]:
+    """Return fresh cached scrape results for cache_key, or None on a miss."""
+    cached_data = _read_cache(cache_file, max_age)
+    if cached_data is not None:
+        logger.info(f"Using cached data for {cache_key}")
+        logger.debug("Cache data loaded: %d posts found", len(cached_data.get('posts', [])))
+    return cached_data
+
+
+def _store_cached(cache_file: Path, cache_key: str, result: Dict[str, Any]) -> bool:
+    """Write scrape results for cache_key to disk if they contain any posts; returns True if cached."""
+    if not (result and result.get("posts")):
+        return False
+    try:
+        if _write_cache(cache_file, result):
+            logger.info(f"Cached data for {cache_key}")
+        else:
+            logger.info(f"Cached data for {cache_key} unchanged; refreshed timestamp")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to write cache file {cache_file}: {e}")
+        return False
+
+
+def _clean_subreddit(subreddit: str) -> str:
+    """Normalize a subreddit name the way Reddit's URLs expect it: no 'r/' prefix, lowercase."""
+    return subreddit.replace('r/', '').strip().lower()
+
+
+# Keys of the post dicts the scraper produces, in output order
+POST_FIELDS = ("id", "title", "content", "url", "score", "author", "num_comments", "created_utc", "comments")
+
+# Post id -> (num_comments, comments) from an earlier scrape
+KnownComments = Dict[str, Tuple[int, List[Dict[str, Any]]]]
+
+
+def _comments_by_post(data: Dict[str, Any]) -> KnownComments:
+    """Map post id to (num_comments, comments) for the posts in cached scrape results."""
+    return {
+        post["id"]: (post.get("num_comments", 0), post["comments"])
+        for post in data.get("posts", [])
+        if post.get("comments")
+    }
+
+
+def _prune_posts(data: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Return a copy of scrape results whose posts only keep the given fields."""
+    return {**data, "posts": [{key: post[key] for key in fields if key in post} for post in data.get("posts", [])]}
+
+
+def _validators_path(cache_file: Path) -> Path:
+    """Sidecar holding the ETag/Last-Modified of the response behind cache_file."""
+    return cache_file.with_name(cache_file.name + ".http")
+
+
+def _read_validators(cache_file: Path) -> Dict[str, str]:
+    """Load the HTTP validators saved for a cache file, or {} if there are none."""
+    try:
+        return _json_loads(_validators_path(cache_file).read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+# One lock per cache file, shared by every scraper in the process, so that
+# concurrent scrapes of a subreddit never interleave the cache file with its
+# .sig and .http sidecars
+_cache_file_locks: Dict[Path, threading.Lock] = {}
+_cache_file_locks_lock = threading.Lock()
+
+
+def _cache_file_lock(cache_file: Path) -> threading.Lock:
+    """Return the lock guarding cache_file and its sidecars."""
+    with _cache_file_locks_lock:
+        return _cache_file_locks.setdefault(cache_file, threading.Lock())
+
+
+class NotModified(Exception):
+    """Raised by _make_request when a conditional request gets 304 Not Modified."""
+
 
 class RedditScraper: # Renamed class to reflect its function
     def __init__(self):
-        """Initialize the Reddit scraper with a requests session."""
+        """
+        Initialize the Reddit scraper with a requests session.
+
+        Applications should normally share one instance through get_scraper()
+        rather than creating scrapers per request.
+        """
         self.session = requests.Session()
-        self.session.headers.update({"User-Agent": USER_AGENT})
+        # Pool keep-alive connections so listing and comment requests reuse the
+        # same TCP/TLS connection instead of handshaking on every call. The pool
+        # is larger than COMMENT_FETCH_WORKERS so concurrent fetches never evict
+        # live connections. Transient failures and 429s are retried with
+        # backoff (honouring Retry-After); the last response is still returned
+        # so raise_for_status() reports the final status code.
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Accept-Encoding is left to requests' default, which includes br
+        # (smaller than gzip for Reddit's JSON) whenever brotli is installed
+        self.session.headers.update({"User-Agent": USER_AGENT, "Connection": "keep-alive"})
+        # Cache directory is configurable and created once up front rather than
+        # on every cache write
+        self._cache_dir = Path(os.environ.get("SCRAPER_CACHE", "backend"))
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        # Rate-limit budget shared by all threads, fed from Reddit's headers
+        self._rate_limit_lock = threading.Lock()
+        self._rate_limit_remaining = math.inf
+        self._rate_limit_reset_at = 0.0
+        # Threads for fetching the comments of a listing's posts concurrently
+        self._comment_executor = ThreadPoolExecutor(max_workers=COMMENT_FETCH_WORKERS, thread_name_prefix="reddit-comments")
         logger.info("RedditScraper initialized with session")
 
-    def _make_request(self, url: str) -> Dict[str, Any]:
-        """Helper function to make requests to Reddit API."""
+    def _cache_path(self, subreddit: str) -> Path:
+        """Return the cache file used for a subreddit's scrape results."""
+        # Keyed on the cleaned name, so "r/Python" and "python" share one file
+        # and no path separator ends up in the file name
+        name = _clean_subreddit(subreddit).replace("/", "_").replace("\\", "_")
+        return self._cache_dir / f"data_{name}.json"
+
+    def close(self):
+        """Shut down the comment fetch threads and release pooled connections."""
+        self._comment_executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _wait_for_rate_limit(self):
+        """
+        Block until Reddit's rate-limit window allows another request.
+
+        The budget is shared by every thread using this scraper: each request
+        takes one unit, and once fewer than RATE_LIMIT_MIN_REMAINING are left
+        callers wait (one at a time, holding the lock) for the window to reset.
+        """
+        with self._rate_limit_lock:
+            if self._rate_limit_remaining < RATE_LIMIT_MIN_REMAINING:
+                delay = self._rate_limit_reset_at - time.monotonic()
+                if delay > 0:
+                    logger.warning(f"Approaching rate limit. Sleeping for {delay:.2f} seconds.")
+                    time.sleep(delay)
+                # A new window has started; the next response reports its budget
+                self._rate_limit_remaining = math.inf
+            self._rate_limit_remaining -= 1
+
+    def _update_rate_limit(self, headers):
+        """Record the budget Reddit reports in its x-ratelimit-* response headers."""
+        remaining = headers.get('x-ratelimit-remaining')
+        reset = headers.get('x-ratelimit-reset')
+        if remaining is None or reset is None:
+            return
         try:
-            logger.debug(f"Making request to: {url}")
-            response = self.session.get(url, timeout=15) # Increased timeout
+            remaining, reset = float(remaining), float(reset)
+        except ValueError:
+            return
+        now = time.monotonic()
+        with self._rate_limit_lock:
+            if now >= self._rate_limit_reset_at:
+                self._rate_limit_remaining = remaining  # First report for a new window
+            else:
+                # Concurrent responses arrive out of order, so a late one can
+                # report a budget that other requests have already spent
+                self._rate_limit_remaining = min(self._rate_limit_remaining, remaining)
+            self._rate_limit_reset_at = now + reset
+
+    def _make_request(self, url: str, validators: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Helper function to make requests to Reddit API.
+
+        Args:
+            url: URL to fetch
+            validators: Optional ETag/Last-Modified saved from an earlier response
+                to this URL. The request is made conditional on them (raising
+                NotModified on a 304), and the dict is updated in place with the
+                validators of the new response.
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        try:
+            self._wait_for_rate_limit()
+            logger.debug("Making request to: %s", url)
+            # Stream the body so it is read exactly once, as bytes, below
+            response = self.session.get(url, headers=headers, timeout=15, stream=True) # Increased timeout
+            self._update_rate_limit(response.headers)
+            if response.status_code == 304:
+                response.close()
+                raise NotModified(url)
+            # Read the body once, as bytes, and parse those directly instead of going
+            # through response.json(), which first copies it into a decoded str.
+            # response.content (unlike response.raw.read()) turns truncated or
+            # undecodable bodies into RequestExceptions, and loads the error body
+            # so handlers can log response.text.
+            body = response.content
             response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-            
-            # Handle potential rate limiting - basic delay
-            if 'x-ratelimit-remaining' in response.headers and float(response.headers['x-ratelimit-remaining']) < 5:
-                delay = float(response.headers.get('x-ratelimit-reset', 60)) / float(response.headers.get('x-ratelimit-used', 1))
-                logger.warning(f"Approaching rate limit. Sleeping for {delay:.2f} seconds.")
-                time.sleep(delay)
-                
-            return response.json()
+
+            if validators is not None:
+                validators.clear()
+                if response.headers.get("ETag"):
+                    validators["etag"] = response.headers["ETag"]
+                if response.headers.get("Last-Modified"):
+                    validators["last_modified"] = response.headers["Last-Modified"]
+            try:
+                return _json_loads(body)
+            except ValueError as e:
+                raise requests.exceptions.InvalidJSONError(f"Invalid JSON response: {e}", response=response) from e
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed for {url}: {e}")
             raise  # Re-raise the exception
 
     def _fetch_comments(self, subreddit: str, post_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Fetch top comments for a specific post."""
-        comments_url = f"{REDDIT_API_BASE}/r/{subreddit}/comments/{post_id}.json?limit={limit}&sort=top"
+        comments_url = COMMENTS_URL.format(subreddit=subreddit, post_id=post_id, limit=limit)
         try:
             data = self._make_request(comments_url)
             if isinstance(data, list) and len(data) > 1 and 'data' in data[1] and 'children' in data[1]['data']:
                 comments_data = data[1]['data']['children']
-                comments = []
-                for item in comments_data:
-                    if item['kind'] == 't1': # t1 indicates a comment
-                        comment = item['data']
-                        comments.append({
-                            "id": comment.get("id", f"comment_{post_id}_{len(comments)}"),
-                            "content": comment.get("body", ""),
-                            "score": comment.get("score", 0),
-                            "author": comment.get("author", "[deleted]"),
-                            "created_utc": comment.get("created_utc", 0),
-                        })
-                return comments
+                # t1 indicates a comment; the index feeds the fallback id
+                return [
+                    {
+                        "id": comment["id"] if "id" in comment else f"comment_{post_id}_{i}",
+                        "content": comment.get("body", ""),
+                        "score": comment.get("score", 0),
+                        "author": comment.get("author", "[deleted]"),
+                        "created_utc": comment.get("created_utc", 0),
+                    }
+                    for i, comment in enumerate(item['data'] for item in comments_data if item['kind'] == 't1')
+                ]
             else:
                 logger.warning(f"Unexpected comment data structure for post {post_id}")
                 return []
@@ -69,9 +395,20 @@ class RedditScraper: # Renamed class to reflect its function
             logger.error(f"Failed to fetch comments for post {post_id}: {e}")
             return [] # Return empty list on error
 
-    def process_reddit_response(self, raw_data: Dict[str, Any], subreddit: str) -> Dict[str, Any]:
-        """Process the raw JSON response from Reddit's API."""
-        logger.debug(f"Processing Reddit API response for r/{subreddit}")
+    def process_reddit_response(self, raw_data: Dict[str, Any], subreddit: str, known_comments: Optional[KnownComments] = None,
+                                fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """
+        Process the raw JSON response from Reddit's API.
+
+        Args:
+            raw_data: Decoded listing response
+            subreddit: Name of the subreddit the listing belongs to
+            known_comments: Previously fetched comments by post id (see _comments_by_post);
+                posts whose comment count is unchanged reuse them instead of refetching
+            fields: Post keys to keep (see POST_FIELDS); all of them if None. Comments
+                are only fetched when "comments" is among them.
+        """
+        logger.debug("Processing Reddit API response for r/%s", subreddit)
         processed_data = {
             "posts": [],
             "metadata": {
@@ -84,40 +421,79 @@ class RedditScraper: # Renamed class to reflect its function
             logger.error("Invalid or empty data structure received from Reddit API")
             return processed_data # Return empty structure
 
-        posts_data = raw_data['data']['children']
-        processed_data["metadata"]["total_posts"] = len(posts_data)
-
-        for item in posts_data:
-            if item['kind'] == 't3': # t3 indicates a post
-                post_data = item['data']
-                post_id = post_data.get("id")
-                
-                # Fetch comments if the post has any
-                comments = []
-                if post_id and post_data.get("num_comments", 0) > 0:
-                    comments = self._fetch_comments(subreddit, post_id)
-                    time.sleep(1) # Add a small delay between requests to respect rate limits
-
-                post = {
-                    "id": post_id or f"post_{subreddit}_{len(processed_data['posts'])}",
-                    "title": post_data.get("title", ""),
-                    "content": post_data.get("selftext", ""),
-                    "url": f"{REDDIT_API_BASE}{post_data.get('permalink', '')}",
-                    "score": post_data.get("score", 0),
-                    "author": post_data.get("author", "[deleted]"),
-                    "num_comments": post_data.get("num_comments", 0),
-                    "created_utc": post_data.get("created_utc", 0),
-                    "comments": comments
-                }
-                processed_data["posts"].append(post)
-            else:
-                logger.warning(f"Skipping non-post item kind: {item.get('kind')}")
+        return self._process_posts(raw_data['data']['children'], subreddit, known_comments, fields)
+
+    def _process_posts(self, posts_data: List[Dict[str, Any]], subreddit: str, known_comments: Optional[KnownComments] = None,
+                       fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """Turn a subreddit's listing items into our post format, fetching comments if wanted."""
+        known_comments = known_comments or {}
+        want_comments = fields is None or "comments" in fields
+        # Fallback id prefix is built once rather than per post
+        id_prefix = f"post_{subreddit}_"
+
+        # Pick out the posts once so the loop below needs no kind checks
+        post_items = [item['data'] for item in posts_data if item['kind'] == 't3'] # t3 indicates a post
+        if len(post_items) != len(posts_data):
+            logger.warning(f"Skipping non-post item kinds: {[item.get('kind') for item in posts_data if item['kind'] != 't3']}")
+
+        # Build the posts first and collect the ones whose comments are needed
+        posts = [None] * len(post_items)
+        comment_fetches = []
+        for index, post_data in enumerate(post_items):
+            get = post_data.get
+            post_id = get("id")
+            num_comments = get("num_comments", 0)
+
+            post = {
+                "id": post_id or id_prefix + str(index),
+                "title": get("title", ""),
+                "content": get("selftext", ""),
+                "url": REDDIT_API_BASE + get('permalink', ''),
+                "score": get("score", 0),
+                "author": get("author", "[deleted]"),
+                "num_comments": num_comments,
+                "created_utc": get("created_utc", 0),
+                "comments": []
+            }
+            posts[index] = post
+
+            # Fetch comments if the post has any, unless they were already
+            # fetched recently and the comment count has not moved since
+            if want_comments and post_id and num_comments > 0:
+                known = known_comments.get(post_id)
+                if known is not None and known[0] == num_comments:
+                    post["comments"] = known[1]
+                else:
+                    comment_fetches.append((post, post_id))
+
+        processed_data = {
+            "posts": posts,
+            "metadata": {
+                "subreddit": subreddit,
+                "total_posts": len(posts_data)
+            }
+        }
+
+        if known_comments and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Reused comments for %d posts in r/%s",
+                         sum(1 for post in processed_data["posts"] if post["comments"]), subreddit)
+
+        # Comment requests are independent and I/O bound, so run them on the
+        # shared pool; _make_request still backs off on Reddit's rate-limit headers
+        comment_lists = self._comment_executor.map(
+            lambda post_id: self._fetch_comments(subreddit, post_id),
+            [post_id for _, post_id in comment_fetches]
+        )
+        for (post, _), comments in zip(comment_fetches, comment_lists):
+            post["comments"] = comments
 
         logger.info(f"Successfully processed {len(processed_data['posts'])} posts from r/{subreddit}")
+        if fields is not None:
+            return _prune_posts(processed_data, fields)
         return processed_data
 
 
-    def scrape_subreddit(self, subreddit: str, max_pages=1, cache=True):
+    def scrape_subreddit(self, subreddit: str, max_pages=1, cache=True, fields: Optional[Tuple[str, ...]] = None):
         """
         Scrape a subreddit using Reddit's JSON API.
 
@@ -125,49 +501,172 @@ class RedditScraper: # Renamed class to reflect its function
             subreddit: Name of the subreddit to scrape
             max_pages: (Currently ignored, fetches one page of 'hot')
             cache: Whether to use cached data if available
+            fields: Post keys to return (see POST_FIELDS); all of them if None
         """
-        cache_file = f"backend/data_{subreddit}.json"
+        return self.scrape_subreddits([subreddit], cache=cache, fields=fields)[subreddit]
 
-        # Remove 'r/' prefix if present and ensure lowercase
-        clean_subreddit = subreddit.replace('r/', '').strip().lower()
-        logger.debug(f"Scraping subreddit: r/{clean_subreddit}")
+    def scrape_subreddits(self, subreddits: List[str], limit: int = 25, cache: bool = True,
+                          fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Scrape several subreddits with as few combined listing requests as possible.
 
-        # Check cache first if enabled
-        if cache and os.path.exists(cache_file):
-            logger.info(f"Found cache file for r/{clean_subreddit}")
-            try:
-                with open(cache_file, "r") as f:
-                    cached_data = json.load(f)
-                    logger.debug(f"Cache data loaded: {len(cached_data.get('posts', []))} posts found")
-                    return cached_data
-            except json.JSONDecodeError as e:
-                logger.warning(f"Cache read failed for r/{clean_subreddit} (invalid JSON): {str(e)}. Re-fetching.")
-            except Exception as e:
-                logger.warning(f"Cache read failed for r/{clean_subreddit}: {str(e)}. Re-fetching.")
-
-        # Prepare the Reddit JSON API URL for 'hot' posts
-        url = f"{REDDIT_API_BASE}/r/{clean_subreddit}/hot.json?limit=25" # Fetch 25 posts
-        logger.info(f"Fetching data from {url} using Reddit API")
+        Reddit serves the hot posts of several subreddits from one
+        /r/a+b+c listing, so N subreddits cost one round trip instead of N.
+        That listing is ranked across all of them, so a busy subreddit can
+        crowd a smaller one out of it; when the combined listing comes back
+        full, any subreddit left with fewer than limit posts is refetched on
+        its own listing. More subreddits than fit in one listing (limit posts
+        each, at most MAX_LISTING_LIMIT) are split across several combined
+        listings; those requests, like the refetches, run concurrently.
+
+        Subreddits with fresh cache entries (younger than SCRAPER_CACHE_TTL)
+        are not fetched again; for the rest, comments from an expired cache
+        file are reused for posts whose comment count is unchanged. A single
+        expired subreddit is revalidated with a conditional request
+        (If-None-Match/If-Modified-Since), and on 304 Not Modified its cached
+        copy is served without downloading or processing the listing again.
+
+        Args:
+            subreddits: Names of the subreddits to scrape
+            limit: Maximum number of posts to keep per subreddit
+            cache: Whether to use and update the per-subreddit cache files
+            fields: Post keys to return (see POST_FIELDS); all of them if None.
+                Leaving out "comments" skips the per-post comment requests. Cache
+                hits are pruned to these fields, but pruned fetches are not cached.
+
+        Returns:
+            Mapping of each requested name to the same structure scrape_subreddit returns
+        """
+        if fields is not None:
+            unknown = set(fields).difference(POST_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown post fields: {sorted(unknown)}")
+            fields = tuple(key for key in POST_FIELDS if key in fields)
+
+        results = {}
+        missing = []
+        known_comments = {}
+        stale = {}
+        stale_validators = {}
+        # Only complete results are written back, so pruned fetches skip the cache
+        store = cache and fields is None
+        # Validators are per listing URL, so only a single-subreddit fetch can
+        # be conditional, and only when there is a cached copy to fall back on
+        conditional = store and len(subreddits) == 1
+        for subreddit in subreddits:
+            if cache:
+                cache_file = self._cache_path(subreddit)
+                cached_data = _load_cached(cache_file, subreddit, SCRAPER_CACHE_TTL)
+                if cached_data is not None:
+                    results[subreddit] = cached_data if fields is None else _prune_posts(cached_data, fields)
+                    continue
+                # Read the stale copy and its validators together, so a concurrent
+                # rewrite cannot pair them with each other's data
+                with _cache_file_lock(cache_file):
+                    stale_data = _read_cache(cache_file, COMMENT_REUSE_MAX_AGE)
+                    if stale_data is not None and conditional:
+                        stale_validators[subreddit] = _read_validators(cache_file)
+                if stale_data is not None:
+                    stale[subreddit] = stale_data
+                    known_comments.update(_comments_by_post(stale_data))
+            missing.append(subreddit)
+
+        if not missing:
+            return results
+
+        validators = None
+        if conditional:
+            validators = stale_validators.get(missing[0], {})
 
         try:
-            reddit_data = self._make_request(url)
-            logger.debug(f"Raw Reddit API response received (keys: {list(reddit_data.keys())})")
+            fetched = self._fetch_subreddits(missing, limit, known_comments, validators, fields)
+        except NotModified:
+            subreddit = missing[0]
+            logger.info(f"r/{subreddit} not modified since last scrape; using cached data")
+            cache_file = self._cache_path(subreddit)
+            try:
+                os.utime(cache_file)  # Restart the TTL window
+            except OSError as e:
+                logger.warning(f"Failed to refresh cache timestamp for {cache_file}: {e}")
+            results[subreddit] = stale[subreddit]
+            return results
 
-            # Transform the data to our expected format
-            processed_data = self.process_reddit_response(reddit_data, clean_subreddit)
+        for subreddit in missing:
+            results[subreddit] = fetched[subreddit]
+            if store:
+                cache_file = self._cache_path(subreddit)
+                validators_file = _validators_path(cache_file)
+                # Hold the file's lock across the whole sequence so concurrent scrapes
+                # cannot mix one's data with the other's .sig or .http sidecar
+                with _cache_file_lock(cache_file):
+                    # Drop the old validators before the cache is rewritten: they describe
+                    # the previous response, and a later 304 must never vouch for data
+                    # they did not come with. Keep the old cache if that is not possible.
+                    try:
+                        validators_file.unlink(missing_ok=True)
+                    except OSError as e:
+                        logger.warning(f"Failed to remove HTTP validators for {cache_file}: {e}")
+                        continue
+                    # Only remember validators for data that actually reached the cache
+                    if _store_cached(cache_file, subreddit, fetched[subreddit]) and validators:
+                        try:
+                            validators_file.write_bytes(_json_dumps(validators))
+                        except OSError as e:
+                            logger.warning(f"Failed to save HTTP validators for {cache_file}: {e}")
+                            try:
+                                validators_file.unlink(missing_ok=True)  # Don't leave a partial file behind
+                            except OSError:
+                                pass
+        return results
 
-            # Save to cache if enabled and data is valid
-            if cache and processed_data and processed_data.get("posts"):
-                os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-                try:
-                    with open(cache_file, "w") as f:
-                        json.dump(processed_data, f, indent=2)
-                    logger.info(f"Cached data for r/{clean_subreddit}")
-                except Exception as e:
-                     logger.error(f"Failed to write cache file {cache_file}: {e}")
+    def _fetch_subreddits(self, subreddits: List[str], limit: int = 25, known_comments: Optional[KnownComments] = None,
+                          validators: Optional[Dict[str, str]] = None, fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch and process the hot listing for one or more subreddits, bypassing the cache."""
+        # Remove 'r/' prefix if present and ensure lowercase
+        clean_names = {subreddit: _clean_subreddit(subreddit) for subreddit in subreddits}
+        clean_subreddits = list(dict.fromkeys(clean_names.values()))
+        clean_subreddit = "+".join(clean_subreddits)
+        logger.debug("Scraping subreddit: r/%s", clean_subreddit)
 
-            return processed_data
+        # Prepare the Reddit JSON API URLs for 'hot' posts. A combined listing
+        # is ranked across all of its subreddits, so it asks for limit posts
+        # per subreddit; since Reddit caps a listing at MAX_LISTING_LIMIT,
+        # larger sets are split into several combined listings.
+        batch_size = max(1, MAX_LISTING_LIMIT // max(limit, 1))
+        batches = [clean_subreddits[i:i + batch_size] for i in range(0, len(clean_subreddits), batch_size)]
+        urls = [
+            HOT_LISTING_URL.format(subreddit="+".join(batch), limit=min(limit * len(batch), MAX_LISTING_LIMIT))
+            for batch in batches
+        ]
+        for url in urls:
+            logger.info(f"Fetching data from {url} using Reddit API")
 
+        try:
+            if len(urls) == 1:
+                listings = [self._make_request(urls[0], validators)]
+            else:
+                # The listings are independent, so fetch them concurrently;
+                # processing stays on this thread since it uses the pool too
+                listings = list(self._comment_executor.map(self._make_request, urls))
+
+            # Transform the data to our expected format
+            processed = {}
+            combined = []
+            for batch, reddit_data in zip(batches, listings):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Raw Reddit API response received (keys: %s)", list(reddit_data.keys()))
+                if len(batch) == 1:
+                    # Single subreddits skip bucketing, which also keeps aggregate
+                    # listings like r/all and r/popular intact
+                    processed[batch[0]] = self.process_reddit_response(reddit_data, batch[0], known_comments, fields)
+                else:
+                    combined.append((batch, reddit_data))
+            if combined:
+                processed.update(self._process_combined_responses(combined, limit, known_comments, fields))
+            return {subreddit: processed[clean] for subreddit, clean in clean_names.items()}
+
+        except NotModified:
+            raise # Not an error; the caller serves its cached copy
         except requests.exceptions.HTTPError as e:
              logger.error(f"HTTP error scraping r/{clean_subreddit}: {e.response.status_code} - {e.response.text}")
              # Handle specific cases like private or banned subreddits
@@ -181,32 +680,115 @@ class RedditScraper: # Renamed class to reflect its function
             logger.error(f"Unexpected error scraping r/{clean_subreddit}: {str(e)}", exc_info=True)
             raise
 
+    def _process_combined_responses(self, listings: List[Tuple[List[str], Dict[str, Any]]], limit: int,
+                                    known_comments: Optional[KnownComments] = None,
+                                    fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Split combined /r/a+b+c listings into per-subreddit processed results.
+
+        Args:
+            listings: (cleaned subreddit names, listing returned by Reddit's API)
+                pairs; each listing asked for limit posts per subreddit
+            limit: Maximum number of posts to keep per subreddit
+            known_comments: Previously fetched comments by post id (see _comments_by_post)
+            fields: Post keys to keep (see POST_FIELDS); all of them if None
+        """
+        buckets = {}
+        short = []
+        for subreddits, raw_data in listings:
+            listing_buckets = {subreddit: [] for subreddit in subreddits}
+            buckets.update(listing_buckets)
+            if not raw_data or 'data' not in raw_data or 'children' not in raw_data['data']:
+                logger.error("Invalid or empty data structure received from Reddit API")
+                continue
+            children = raw_data['data']['children']
+            for item in children:
+                bucket = listing_buckets.get(item.get('data', {}).get('subreddit', '').lower())
+                if bucket is not None and len(bucket) < limit:
+                    bucket.append(item)
+            # A short listing holds every hot post there is; a full one may have
+            # ranked some subreddits' posts out of it
+            if len(children) >= limit * len(subreddits):
+                short.extend(subreddit for subreddit, items in listing_buckets.items() if len(items) < limit)
+
+        # Refetch under-filled subreddits on their own listings, all at once;
+        # as above, only the requests run on the pool
+        refetches = {}
+        for subreddit in short:
+            logger.info(f"r/{subreddit} got {len(buckets[subreddit])} of {limit} posts from the combined listing; fetching it on its own")
+            url = HOT_LISTING_URL.format(subreddit=subreddit, limit=min(limit, MAX_LISTING_LIMIT))
+            refetches[subreddit] = self._comment_executor.submit(self._make_request, url)
+
+        results = {}
+        for subreddit, items in buckets.items():
+            if subreddit in refetches:
+                try:
+                    results[subreddit] = self.process_reddit_response(refetches[subreddit].result(), subreddit, known_comments, fields)
+                    continue
+                except requests.exceptions.RequestException as e:
+                    logger.warning(f"Separate fetch of r/{subreddit} failed; keeping its combined listing posts: {e}")
+            results[subreddit] = self._process_posts(items, subreddit, known_comments, fields)
+        return results
+
+
+# Process-wide scraper shared by get_scraper() callers
+_default_scraper = None
+_default_scraper_lock = threading.Lock()
+
+
+def get_scraper() -> RedditScraper:
+    """
+    Return the process-wide RedditScraper, creating it on first use.
+
+    Prefer this over constructing RedditScraper() per request so every caller
+    shares one session (and its pooled keep-alive connections), one comment
+    fetch pool and one rate-limit budget.
+
+    Returns:
+        The shared RedditScraper instance
+    """
+    global _default_scraper
+    if _default_scraper is None:
+        with _default_scraper_lock:
+            if _default_scraper is None:
+                _default_scraper = RedditScraper()
+    return _default_scraper
+
 
 if __name__ == "__main__":
+    _configure_logging(debug=True)
     # Basic test to see if the scraper can be initialized and run
     logger.info("Running basic Reddit scraper test...")
-    try:
-        # Use the correct class name
-        scraper = RedditScraper()
-        test_subreddit = "python" # Use a common subreddit for testing
-        logger.info(f"Attempting to scrape r/{test_subreddit} using Reddit API...")
-        # Disable cache for this specific test run to ensure fresh data
-        data = scraper.scrape_subreddit(test_subreddit, cache=False)
-
-        if data and data.get("posts"):
-            logger.info(f"Successfully scraped r/{test_subreddit} via Reddit API: {len(data['posts'])} posts found.")
-            # Log details of the first post and its comments if available
-            if data['posts']:
+    # Use common subreddits for testing; they are scraped concurrently so the
+    # run takes roughly as long as the slowest subreddit rather than the sum
+    test_subreddits = ["python", "learnpython", "programming"]
+
+    def run_test(scraper: RedditScraper, test_subreddit: str):
+        try:
+            logger.info(f"Attempting to scrape r/{test_subreddit} using Reddit API...")
+            # Disable cache for this specific test run to ensure fresh data
+            data = scraper.scrape_subreddit(test_subreddit, cache=False)
+
+            if data and data.get("posts"):
+                logger.info(f"Successfully scraped r/{test_subreddit} via Reddit API: {len(data['posts'])} posts found.")
+                # Log details of the first post and its comments if available
                 first_post = data['posts'][0]
                 logger.info(f"First post title: {first_post.get('title')}")
                 logger.info(f"Number of comments fetched for first post: {len(first_post.get('comments', []))}")
-                if first_post.get('comments'):
-                     logger.debug(f"First comment (sample): {first_post['comments'][0].get('content', '')[:100]}...")
-        else:
-            logger.warning(f"Scraping r/{test_subreddit} via Reddit API did not return expected data structure.")
-            logger.debug(f"Full response data: {json.dumps(data, indent=2)}")
+                if first_post.get('comments') and logger.isEnabledFor(logging.DEBUG):
+                     logger.debug("First comment (sample): %s...", first_post['comments'][0].get('content', '')[:100])
+            else:
+                logger.warning(f"Scraping r/{test_subreddit} via Reddit API did not return expected data structure.")
+                # Only pay for pretty-printing the payload when DEBUG is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Full response data: %s", json.dumps(data, indent=2))
 
-    except ValueError as ve:
-         logger.error(f"ValueError during test (e.g., subreddit access issue): {ve}")
-    except Exception as e:
-        logger.error(f"Failed to run scraper test: {str(e)}", exc_info=True) 
\ No newline at end of file
+        except ValueError as ve:
+             logger.error(f"ValueError during test for r/{test_subreddit} (e.g., subreddit access issue): {ve}")
+        except Exception as e:
+            logger.error(f"Failed to run scraper test for r/{test_subreddit}: {str(e)}", exc_info=True)
+
+    # Scraping is I/O bound, so threads sharing one pooled session overlap the
+    # network waits without an async rewrite of the scraper
+    with RedditScraper() as scraper, ThreadPoolExecutor(max_workers=len(test_subreddits)) as executor:
+        list(executor.map(lambda sub: run_test(scraper, sub), test_subreddits))
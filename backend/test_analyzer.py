@@ -0,0 +1,164 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import analyzer
+from analyzer import RedditAnalyzer
+
+# Enough distinct text for _use_openai to pick OpenAI over templates
+PAIN_POINTS = [
+    "I struggle with keeping a consistent sleep schedule during exams",
+    "It is hard to stay focused when working from home all day",
+]
+
+
+def chunk(content):
+    """Build a streamed chat completion chunk carrying a content delta."""
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+class FakeOpenAI:
+    """Stand-in OpenAI client whose streams are picked per platform."""
+
+    def __init__(self, streams):
+        self.streams = streams  # platform -> callable returning an iterable of chunks
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, stream=False, **kwargs):
+        platform = "tiktok" if "TikTok" in messages[0]["content"] else "instagram"
+        return self.streams[platform]()
+
+
+class TestPainPointExtraction(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = RedditAnalyzer()
+
+    def test_extract_pain_points(self):
+        text = "Mornings are hard. I struggle with focus every day! Coffee works."
+
+        # Keyword sentences come first, then pattern matches, each in text order
+        self.assertEqual(self.analyzer.extract_pain_points(text), [
+            "Mornings are hard.",
+            "I struggle with focus every day!",
+            "focus every day",
+        ])
+        self.assertEqual(self.analyzer.extract_pain_points(""), [])
+
+    def test_process_subreddit_data(self):
+        data = {"posts": [
+            {
+                "title": "I need help with my sleep schedule",
+                "content": "Mornings are hard. I struggle with focus every day! Coffee works.",
+                "comments": [{"content": "Any tips for staying calm? Try walking."}],
+            },
+            {
+                # A trigger at the end of one text must not capture the next one
+                "title": "Still struggling with",
+                "content": "buses every morning.",
+                "comments": [{"content": "Mornings are hard."}],
+            },
+        ]}
+
+        self.assertEqual(self.analyzer.process_subreddit_data(data), [
+            "I need help with my sleep schedule",
+            "Mornings are hard.",
+            "I struggle with focus every day!",
+            "focus every day",
+            "Any tips for staying calm?",
+            "staying calm",
+        ])
+        self.assertEqual(self.analyzer.process_subreddit_data({}), [])
+
+    def test_punctuation_without_whitespace(self):
+        # Dots inside URLs and ellipses do not end a sentence
+        text = "Check example.com first...it is hard to say. Thanks"
+        self.assertEqual(self.analyzer.extract_pain_points(text), [
+            "Check example.com first...it is hard to say.",
+        ])
+
+    def test_trailing_sentence_without_punctuation(self):
+        text = "Nice weather. This problem is really frustrating"
+        # The keyword sentence runs to the end; patterns need terminal punctuation
+        self.assertEqual(self.analyzer.extract_pain_points(text), [
+            "This problem is really frustrating",
+        ])
+
+    def test_dotted_capital_i_keeps_offsets_aligned(self):
+        # U+0130 lowercases to two code points; results must still be sliced correctly
+        text = "İİİ Visiting İstanbul is hard. Need advice about cheap hotels."
+        self.assertEqual(self.analyzer.extract_pain_points(text), [
+            "İİİ Visiting İstanbul is hard.",
+            "Need advice about cheap hotels.",
+            "about cheap hotels",
+        ])
+
+    def test_overlapping_triggers_keep_leftmost_match(self):
+        # "how do I" sits inside the span captured after "struggle with", so
+        # only the leftmost match is reported
+        text = "I struggle with how do I focus on work."
+        self.assertEqual(self.analyzer.extract_pain_points(text), [
+            "I struggle with how do I focus on work.",
+            "how do I focus on work",
+        ])
+
+
+class TestStreamContentIdeas(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = RedditAnalyzer()
+
+    def stream(self, streams):
+        """Collect stream_content_ideas output per platform, using fake OpenAI streams."""
+        ideas = {"tiktok": [], "instagram": []}
+        with mock.patch.object(analyzer, "_openai_client", FakeOpenAI(streams)):
+            for item in self.analyzer.stream_content_ideas("test", PAIN_POINTS):
+                ideas[item["platform"]].append(item["idea"])
+        return ideas
+
+    def test_deltas_split_across_lines(self):
+        deltas = ["Intro line\n1. First ", "idea\n2. Sec", "ond idea\n", "continued"]
+        ideas = self.stream({
+            "tiktok": lambda: [chunk(delta) for delta in deltas],
+            "instagram": lambda: [chunk("1. Only idea")],
+        })
+
+        self.assertEqual(ideas["tiktok"], ["First idea", "Second idea continued"])
+        self.assertEqual(ideas["instagram"], ["Only idea"])
+
+    def test_failed_stream_falls_back_to_templates(self):
+        def fail():
+            raise RuntimeError("connection reset")
+
+        ideas = self.stream({"tiktok": lambda: [chunk("1. First idea\n")], "instagram": fail})
+
+        templates = self.analyzer.generate_content_ideas_with_templates("test", PAIN_POINTS)
+        self.assertEqual(ideas["tiktok"], ["First idea"])
+        self.assertEqual(ideas["instagram"], templates["instagram"])
+
+    def test_close_does_not_wait_for_streams(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        timer = threading.Timer(5, release.set)  # Unblocks the test if close() hangs
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        def blocked():
+            release.wait()
+            yield chunk("1. Too late")
+
+        with mock.patch.object(analyzer, "_openai_client", FakeOpenAI({
+            "tiktok": blocked,
+            "instagram": lambda: [chunk("1. Only idea")],
+        })):
+            ideas = self.analyzer.stream_content_ideas("test", PAIN_POINTS)
+            self.assertEqual(next(ideas), {"platform": "instagram", "idea": "Only idea"})
+
+            # A client disconnect closes the generator while TikTok is still streaming
+            started = time.monotonic()
+            ideas.close()
+            self.assertLess(time.monotonic() - started, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import json
+import unittest
+from unittest import mock
+
+import analyzer
+import app
+
+AUTH = {"Authorization": f"Bearer {app.SECURE_TOKEN}"}
+
+SUBREDDIT_DATA = {
+    "posts": [{
+        "title": "I struggle with keeping a consistent sleep schedule during exams.",
+        "content": "It is hard to stay focused when working from home all day.",
+        "comments": [{"content": "Any tips for studying with roommates around?"}],
+    }],
+    "metadata": {"subreddit": "test", "total_posts": 1},
+}
+
+
+class TestGenerateContentStream(unittest.TestCase):
+    def setUp(self):
+        app._subreddit_pain_points.cache_clear()
+        app._build_content_response.cache_clear()
+        for patcher in (
+            mock.patch.object(app.scraper, "scrape_subreddit", return_value=SUBREDDIT_DATA),
+            mock.patch.object(analyzer, "_openai_client", None),  # Template ideas
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = app.app.test_client()
+
+    def test_stream_ndjson(self):
+        response = self.client.post("/api/generate-content/stream", json={"subreddit": "test"}, headers=AUTH)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        # First line: pain points and metadata
+        pain_points = app.analyzer.process_subreddit_data(SUBREDDIT_DATA)
+        self.assertEqual(lines[0], {
+            "subreddit": "test",
+            "pain_points": pain_points[:5],
+            "metadata": {"total_pain_points": len(pain_points), "platform": "all"},
+        })
+
+        # Then one line per idea
+        templates = app.analyzer.generate_content_ideas_with_templates("test", pain_points)
+        expected = [{"platform": name, "idea": idea} for name, ideas in templates.items() for idea in ideas]
+        self.assertEqual(lines[1:], expected)
+
+    def test_stream_rejects_invalid_requests(self):
+        response = self.client.post("/api/generate-content/stream", json={"subreddit": "test", "max_pages": [1]}, headers=AUTH)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.get_json())
+
+        response = self.client.post("/api/generate-content/stream", json={"subreddit": "test"})
+        self.assertEqual(response.status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
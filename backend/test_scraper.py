@@ -1,82 +1,336 @@
+import http.client
+import io
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
-from scraper import FirecrawlScraper
+from unittest import mock
 
-class TestFirecrawlScraper(unittest.TestCase):
+import requests
+import urllib3
+from requests.structures import CaseInsensitiveDict
+
+from scraper import RedditScraper, COMMENTS_URL, HOT_LISTING_URL, SCRAPER_CACHE_TTL, _store_cached
+
+# Minimal Reddit listing: two posts (one with comments) and a non-post item
+LISTING = {
+    "kind": "Listing",
+    "data": {
+        "children": [
+            {"kind": "t3", "data": {
+                "id": "abc", "subreddit": "test", "title": "Test Post", "selftext": "This is test content",
+                "permalink": "/r/test/comments/abc/test_post/", "score": 42, "author": "alice",
+                "num_comments": 1, "created_utc": 1700000000.0,
+            }},
+            {"kind": "t3", "data": {
+                "id": "def", "subreddit": "test", "title": "Quiet Post", "selftext": "",
+                "permalink": "/r/test/comments/def/quiet_post/", "score": 1, "author": "bob",
+                "num_comments": 0, "created_utc": 1700000100.0,
+            }},
+            {"kind": "t5", "data": {"display_name": "test"}},
+        ]
+    }
+}
+
+COMMENTS = [
+    LISTING,
+    {"kind": "Listing", "data": {"children": [
+        {"kind": "t1", "data": {"id": "c1", "body": "This is a comment", "score": 5, "author": "carol",
+                                "created_utc": 1700000200.0}},
+        {"kind": "more", "data": {"count": 3}},
+    ]}},
+]
+
+
+class TruncatedBody(io.BytesIO):
+    """Body whose connection drops before the promised Content-Length arrives."""
+
+    def read(self, *args):
+        raise http.client.IncompleteRead(super().read(), 1024)
+
+
+def make_response(url, payload=None, status=200, headers=None, truncated=False):
+    """Build a streamed requests.Response the way the HTTP adapter would."""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.reason = {304: "Not Modified", 404: "Not Found"}.get(status, "OK")
+    response.headers = CaseInsensitiveDict(headers or {})
+    fp = TruncatedBody(body[:len(body) // 2]) if truncated else io.BytesIO(body)
+    response.raw = urllib3.HTTPResponse(body=fp, status=status, preload_content=False)
+    return response
+
+
+class TestRedditScraper(unittest.TestCase):
     def setUp(self):
-        self.scraper = FirecrawlScraper()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        with mock.patch.dict(os.environ, {"SCRAPER_CACHE": self.tmpdir.name}):
+            self.scraper = RedditScraper()
+        self.addCleanup(self.scraper.close)
+
+        self.routes = {
+            HOT_LISTING_URL.format(subreddit="test", limit=25): LISTING,
+            COMMENTS_URL.format(subreddit="test", post_id="abc", limit=10): COMMENTS,
+        }
+        self.etags = {}  # URL -> ETag the fake server sends (and answers 304 to)
+        self.requested = []
+        get = mock.patch.object(self.scraper.session, "get", side_effect=self.fake_get)
+        get.start()
+        self.addCleanup(get.stop)
+
+    def fake_get(self, url, headers=None, **kwargs):
+        self.requested.append(url)
+        if url in self.routes:
+            etag = self.etags.get(url)
+            if etag and (headers or {}).get("If-None-Match") == etag:
+                return make_response(url, status=304)
+            return make_response(url, self.routes[url], headers={"ETag": etag} if etag else None)
+        return make_response(url, {"message": "Not Found", "error": 404}, status=404)
 
     def test_scrape_subreddit(self):
-        # Test with a real subreddit
-        result = self.scraper.scrape_subreddit("test")
-        
+        result = self.scraper.scrape_subreddit("test", cache=False)
+
         # Check the structure of the response
         self.assertIsInstance(result, dict)
         self.assertIn("posts", result)
         self.assertIn("metadata", result)
-        
+
         # Check metadata
         self.assertEqual(result["metadata"]["subreddit"], "test")
-        self.assertIsInstance(result["metadata"]["total_posts"], int)
-        
-        # Check posts
-        self.assertIsInstance(result["posts"], list)
-        if result["posts"]:  # If we got any posts
-            first_post = result["posts"][0]
-            self.assertIn("id", first_post)
-            self.assertIn("title", first_post)
-            self.assertIn("content", first_post)
-            self.assertIn("comments", first_post)
-
-    def test_process_firecrawl_response(self):
-        # Test with sample data
-        sample_data = {
-            "content": [{
-                "text": "## Test Post\nThis is test content\n### Comment\nThis is a comment"
-            }]
-        }
-        
-        result = self.scraper.process_firecrawl_response(sample_data, "test")
-        
-        # Check the structure
-        self.assertIn("posts", result)
-        self.assertIn("metadata", result)
-        self.assertEqual(result["metadata"]["subreddit"], "test")
-        
-        # Check the processed post
+        self.assertEqual(result["metadata"]["total_posts"], 3)
+
+        # Check posts; the t5 item is skipped and only posts with comments trigger a fetch
         posts = result["posts"]
-        self.assertEqual(len(posts), 1)
+        self.assertEqual([post["id"] for post in posts], ["abc", "def"])
         self.assertEqual(posts[0]["title"], "Test Post")
-        self.assertIn("This is test content", posts[0]["content"])
-        
-        # Check comments
+        self.assertEqual(posts[0]["content"], "This is test content")
+        self.assertEqual(posts[0]["url"], "https://www.reddit.com/r/test/comments/abc/test_post/")
+        self.assertEqual(len(self.requested), 2)
+
+        # Check comments; the "more" stub is dropped
         comments = posts[0]["comments"]
         self.assertEqual(len(comments), 1)
-        self.assertIn("This is a comment", comments[0]["content"])
-
-    def test_extract_posts_from_markdown(self):
-        # Test with empty content
-        empty_posts = self.scraper.extract_posts_from_markdown("", "test")
-        self.assertEqual(len(empty_posts), 5)  # Should return 5 dummy posts
-        
-        # Test with valid markdown
-        markdown = """## First Post
-Content for first post
-### Comment 1
-First comment
-### Comment 2
-Second comment
-
-## Second Post
-Content for second post
-### Comment 3
-Third comment"""
-        
-        posts = self.scraper.extract_posts_from_markdown(markdown, "test")
-        self.assertEqual(len(posts), 2)
-        self.assertEqual(posts[0]["title"], "First Post")
-        self.assertEqual(len(posts[0]["comments"]), 2)
-        self.assertEqual(posts[1]["title"], "Second Post")
-        self.assertEqual(len(posts[1]["comments"]), 1)
+        self.assertEqual(comments[0]["content"], "This is a comment")
+        self.assertEqual(posts[1]["comments"], [])
+
+    def test_scrape_subreddit_uses_cache(self):
+        first = self.scraper.scrape_subreddit("test")
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, "data_test.json")))
+
+        self.requested.clear()
+        second = self.scraper.scrape_subreddit("test")
+        self.assertEqual(second, first)
+        self.assertEqual(self.requested, [])
+
+    def expire_cache(self, subreddit):
+        """Age a cache file past the TTL, leaving it old enough to revalidate."""
+        stale = time.time() - SCRAPER_CACHE_TTL - 60
+        os.utime(os.path.join(self.tmpdir.name, f"data_{subreddit}.json"), (stale, stale))
+
+    def test_scrape_subreddit_not_modified(self):
+        listing_url = HOT_LISTING_URL.format(subreddit="test", limit=25)
+        self.etags[listing_url] = '"v1"'
+        first = self.scraper.scrape_subreddit("test")
+        with open(os.path.join(self.tmpdir.name, "data_test.json.http")) as f:
+            self.assertEqual(json.load(f), {"etag": '"v1"'})
+
+        # An expired cache is revalidated, and a 304 serves it without refetching comments
+        self.expire_cache("test")
+        self.requested.clear()
+        self.assertEqual(self.scraper.scrape_subreddit("test"), first)
+        self.assertEqual(self.requested, [listing_url])
+
+    def test_scrape_subreddit_drops_stale_validators(self):
+        listing_url = HOT_LISTING_URL.format(subreddit="test", limit=25)
+        self.etags[listing_url] = '"v1"'
+        self.scraper.scrape_subreddit("test")
+
+        # A changed listing sent without an ETag replaces the cache, so the
+        # old validators have to go with it
+        changed = json.loads(json.dumps(LISTING))
+        changed["data"]["children"][0]["data"]["title"] = "Changed Title"
+        self.routes[listing_url] = changed
+        del self.etags[listing_url]
+        self.expire_cache("test")
+        result = self.scraper.scrape_subreddit("test")
+
+        self.assertEqual(result["posts"][0]["title"], "Changed Title")
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "data_test.json.http")))
+
+    def test_concurrent_scrapes_serialize_cache_writes(self):
+        listing_url = HOT_LISTING_URL.format(subreddit="test", limit=25)
+        self.etags[listing_url] = '"v1"'
+        entered = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        stores = []
+
+        def slow_store(*args):
+            stores.append(args)
+            if len(stores) == 1:  # Hold the first writer inside its store sequence
+                entered.set()
+                release.wait(5)
+            return _store_cached(*args)
+
+        with mock.patch("scraper._store_cached", side_effect=slow_store):
+            first = threading.Thread(target=self.scraper.scrape_subreddit, args=("test",))
+            first.start()
+            self.assertTrue(entered.wait(5))
+
+            # A second scrape of the same subreddit sees a newer listing, but
+            # must wait for the first one to finish writing its cache and sidecars
+            self.etags[listing_url] = '"v2"'
+            second = threading.Thread(target=self.scraper.scrape_subreddit, args=("test",))
+            second.start()
+            second.join(0.2)
+            self.assertEqual(len(stores), 1)
+
+            release.set()
+            first.join(5)
+            second.join(5)
+
+        self.assertEqual(len(stores), 2)
+        with open(os.path.join(self.tmpdir.name, "data_test.json.http")) as f:
+            self.assertEqual(json.load(f), {"etag": '"v2"'})
+
+    def test_scrape_subreddit_reuses_comments(self):
+        listing_url = HOT_LISTING_URL.format(subreddit="test", limit=25)
+        first = self.scraper.scrape_subreddit("test")
+
+        # An expired cache still supplies comments for posts whose count is unchanged
+        self.expire_cache("test")
+        self.requested.clear()
+        self.assertEqual(self.scraper.scrape_subreddit("test"), first)
+        self.assertEqual(self.requested, [listing_url])
+
+        # A new comment count means the comments are fetched again
+        changed = json.loads(json.dumps(LISTING))
+        changed["data"]["children"][0]["data"]["num_comments"] = 2
+        self.routes[listing_url] = changed
+        self.expire_cache("test")
+        self.requested.clear()
+        self.scraper.scrape_subreddit("test")
+        self.assertEqual(self.requested, [listing_url, COMMENTS_URL.format(subreddit="test", post_id="abc", limit=10)])
+
+    def test_rate_limit_budget_shared_with_comment_fetches(self):
+        def limited_get(url, **kwargs):
+            response = self.fake_get(url, **kwargs)
+            response.headers.update({"x-ratelimit-remaining": "1", "x-ratelimit-reset": "30"})
+            return response
+        self.scraper.session.get.side_effect = limited_get
+
+        # The listing leaves too little budget, so the comment fetch waits for the reset
+        with mock.patch("scraper.time.sleep") as sleep:
+            result = self.scraper.scrape_subreddit("test", cache=False)
+        sleep.assert_called_once()
+        self.assertTrue(0 < sleep.call_args[0][0] <= 30)
+        self.assertEqual(len(result["posts"][0]["comments"]), 1)
+
+    def test_scrape_subreddit_prefixed_name(self):
+        first = self.scraper.scrape_subreddit("r/Test")
+
+        # The cache file is named after the cleaned name and shared with it
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir.name, "data_test.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "data_r")))
+        self.requested.clear()
+        self.assertEqual(self.scraper.scrape_subreddit("test"), first)
+        self.assertEqual(self.requested, [])
+
+    def test_scrape_subreddit_fields(self):
+        result = self.scraper.scrape_subreddit("test", fields=("title", "id"))
+
+        # Posts are pruned, comments are never fetched and nothing is cached
+        self.assertEqual(result["posts"], [{"id": "abc", "title": "Test Post"}, {"id": "def", "title": "Quiet Post"}])
+        self.assertEqual(self.requested, [HOT_LISTING_URL.format(subreddit="test", limit=25)])
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "data_test.json")))
+
+        # Cache hits are pruned the same way
+        self.scraper.scrape_subreddit("test")
+        self.requested.clear()
+        cached = self.scraper.scrape_subreddit("test", fields=("id", "comments"))
+        self.assertEqual(self.requested, [])
+        self.assertEqual(set(cached["posts"][0]), {"id", "comments"})
+
+        with self.assertRaises(ValueError):
+            self.scraper.scrape_subreddit("test", fields=("selftext",))
+
+    def test_scrape_subreddit_truncated_comments(self):
+        comments_url = COMMENTS_URL.format(subreddit="test", post_id="abc", limit=10)
+        self.scraper.session.get.side_effect = lambda url, **kwargs: (
+            make_response(url, COMMENTS, truncated=True) if url == comments_url else self.fake_get(url, **kwargs)
+        )
+
+        # A cut-off comments body only costs that post its comments
+        result = self.scraper.scrape_subreddit("test", cache=False)
+        self.assertEqual([post["id"] for post in result["posts"]], ["abc", "def"])
+        self.assertEqual(result["posts"][0]["comments"], [])
+
+    def test_scrape_subreddit_not_accessible(self):
+        with self.assertRaises(ValueError):
+            self.scraper.scrape_subreddit("doesnotexist", cache=False)
+
+    def test_process_reddit_response(self):
+        result = self.scraper.process_reddit_response(LISTING, "test")
+
+        self.assertEqual(result["metadata"], {"subreddit": "test", "total_posts": 3})
+        self.assertEqual(len(result["posts"]), 2)
+        self.assertEqual(result["posts"][0]["author"], "alice")
+        self.assertEqual(len(result["posts"][0]["comments"]), 1)
+
+        # Invalid data yields the empty structure
+        empty = self.scraper.process_reddit_response({}, "test")
+        self.assertEqual(empty["posts"], [])
+        self.assertEqual(empty["metadata"]["total_posts"], 0)
+
+    def test_scrape_subreddits_combined_listing(self):
+        combined = json.loads(json.dumps(LISTING))
+        combined["data"]["children"][1]["data"]["subreddit"] = "Other"
+        self.routes[HOT_LISTING_URL.format(subreddit="test+other", limit=50)] = combined
+
+        results = self.scraper.scrape_subreddits(["test", "other"], cache=False)
+
+        self.assertEqual(self.requested[0], HOT_LISTING_URL.format(subreddit="test+other", limit=50))
+        self.assertEqual([post["id"] for post in results["test"]["posts"]], ["abc"])
+        self.assertEqual([post["id"] for post in results["other"]["posts"]], ["def"])
+
+    def test_scrape_subreddits_splits_large_listings(self):
+        # At limit=50 only two subreddits fit in one 100-post listing
+        combined = json.loads(json.dumps(LISTING))
+        combined["data"]["children"][1]["data"]["subreddit"] = "Other"
+        third = json.loads(json.dumps(LISTING))
+        third["data"]["children"] = [third["data"]["children"][1]]
+        third["data"]["children"][0]["data"].update(id="xyz", subreddit="third")
+        self.routes[HOT_LISTING_URL.format(subreddit="test+other", limit=100)] = combined
+        self.routes[HOT_LISTING_URL.format(subreddit="third", limit=50)] = third
+
+        results = self.scraper.scrape_subreddits(["test", "other", "third"], limit=50, cache=False)
+
+        listing_urls = [url for url in self.requested if "/hot.json" in url]
+        self.assertCountEqual(listing_urls, [
+            HOT_LISTING_URL.format(subreddit="test+other", limit=100),
+            HOT_LISTING_URL.format(subreddit="third", limit=50),
+        ])
+        self.assertEqual([post["id"] for post in results["other"]["posts"]], ["def"])
+        self.assertEqual([post["id"] for post in results["third"]["posts"]], ["xyz"])
+
+    def test_scrape_subreddits_refetches_crowded_out_subreddit(self):
+        # The full combined listing only holds r/test posts
+        self.routes[HOT_LISTING_URL.format(subreddit="test+other", limit=2)] = LISTING
+        other = json.loads(json.dumps(LISTING))
+        other["data"]["children"] = [other["data"]["children"][1]]
+        other["data"]["children"][0]["data"].update(id="xyz", subreddit="other")
+        self.routes[HOT_LISTING_URL.format(subreddit="other", limit=1)] = other
+
+        results = self.scraper.scrape_subreddits(["test", "other"], limit=1, cache=False)
+
+        self.assertEqual([post["id"] for post in results["test"]["posts"]], ["abc"])
+        self.assertEqual([post["id"] for post in results["other"]["posts"]], ["xyz"])
+        self.assertIn(HOT_LISTING_URL.format(subreddit="other", limit=1), self.requested)
+
 
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()